@@ -14,12 +14,16 @@ Melhorias v3:
 """
 
 from pathlib import Path
+import mmap
+import os
 import shutil
 import logging
 import re
 from typing import Optional
 from dataclasses import dataclass
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 
 try:
     from defusedxml import ElementTree as ET
@@ -28,6 +32,109 @@ except ImportError:
     import xml.etree.ElementTree as ET
     USING_DEFUSED = False
 
+try:
+    from lxml import etree as LET
+    HAS_LXML = True
+except ImportError:
+    LET = None
+    HAS_LXML = False
+
+try:
+    # Extensão Cython opcional (python setup.py build_ext --inplace)
+    import repair_ext
+    HAS_REPAIR_EXT = True
+except ImportError:
+    repair_ext = None
+    HAS_REPAIR_EXT = False
+
+try:
+    # Kernel opcional compilado (Numba) para a reescrita 'É' → 'E' em
+    # bytes: um único loop sem a cópia intermediária de bytes.replace
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _rewrite_e_acute_kernel(src, dst):
+        n = src.size
+        i = 0
+        j = 0
+        while i < n:
+            if src[i] == 0xC3 and i + 1 < n and src[i + 1] == 0x89:
+                dst[j] = 0x45  # 'E'
+                i += 2
+            else:
+                dst[j] = src[i]
+                i += 1
+            j += 1
+        return j
+
+    HAS_NUMBA = True
+except ImportError:
+    np = None
+    HAS_NUMBA = False
+
+# Erros de parse que disparam a tentativa de reparo
+_PARSE_ERRORS = (ET.ParseError, LET.XMLSyntaxError) if HAS_LXML else (ET.ParseError,)
+
+# Classe ElementTree "crua" para embrulhar raízes vindas de fromstring
+# (defusedxml só reexporta as funções de parse, não a classe)
+from xml.etree.ElementTree import ElementTree as _ETreeClass
+
+# Padrões compilados uma única vez (evita lookup no cache do re por arquivo)
+_OPEN_TAG = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*>')
+_CLOSE_TAG = re.compile(r'</([a-zA-Z][a-zA-Z0-9]*)>')
+
+# A partir deste tamanho o caminho rápido usa mmap + edição in-place,
+# em vez de materializar leitura e escrita do arquivo inteiro em Python
+_MMAP_THRESHOLD = 1 << 20  # 1 MiB
+
+# Tabela de deleção dos caracteres de controle inválidos em XML;
+# str.translate com deleção pura roda num único loop em C
+_CTRL_DELETE_TABLE = dict.fromkeys(
+    list(range(0x00, 0x09)) + [0x0B, 0x0C] + list(range(0x0E, 0x20)), None
+)
+
+
+def _replace_target_bytes(text: bytes, needle: bytes, replacement: bytes) -> bytes:
+    """
+    Substitui needle por replacement num buffer de bytes.
+
+    No caso padrão ('É' → 'E') com Numba instalado, usa o kernel
+    compilado, que evita a alocação da cópia completa de bytes.replace e
+    dispensa qualquer decode UTF-8; caso contrário, cai no próprio
+    bytes.replace (que já roda em C).
+    """
+    if HAS_NUMBA and needle == b'\xc3\x89' and replacement == b'E':
+        src = np.frombuffer(text, dtype=np.uint8)
+        dst = np.empty(src.size, dtype=np.uint8)
+        length = _rewrite_e_acute_kernel(src, dst)
+        return dst[:length].tobytes()
+    return text.replace(needle, replacement)
+
+
+def _find_unclosed_tags(content: str) -> dict:
+    """
+    Conta tags abertas sem fechamento correspondente.
+
+    Com a extensão compilada (repair_ext), faz uma única passada em C
+    sobre os bytes; sem ela, usa as duas varreduras de regex originais.
+    """
+    if HAS_REPAIR_EXT:
+        return {
+            tag.decode('ascii'): count
+            for tag, count in repair_ext.unclosed_tags(content.encode('utf-8')).items()
+        }
+
+    open_tags = _OPEN_TAG.findall(content)
+    close_tags = _CLOSE_TAG.findall(content)
+
+    open_count = Counter(open_tags)
+    close_count = Counter(close_tags)
+
+    return {tag: count - close_count.get(tag, 0)
+            for tag, count in open_count.items()
+            if count > close_count.get(tag, 0)}
+
 
 @dataclass
 class Config:
@@ -42,6 +149,7 @@ class Config:
     try_repair: bool = True  # Tenta reparar XMLs malformados
     create_backup: bool = True  # Cria backup antes de alterar
     log_level: str = "INFO"
+    max_workers: Optional[int] = None  # None = os.cpu_count()
 
 
 class XMLProcessor:
@@ -50,6 +158,25 @@ class XMLProcessor:
     def __init__(self, config: Config):
         self.config = config
         self.stats = Counter()
+        # Padrões em bytes para o pré-filtro (UTF-8 + entidade HTML)
+        self._needles = [config.old_value.encode('utf-8')]
+        if config.old_value == 'É':
+            self._needles.append(b'&Eacute;')
+        # Localiza <xTexto ...>texto</xTexto> direto nos bytes, para o
+        # caminho rápido que dispensa parse + serialização
+        tag = re.escape(config.target_element).encode('ascii')
+        self._target_text_re = re.compile(
+            rb'(<(?:\w+:)?' + tag + rb'\b[^>]*>)([^<]*)(</(?:\w+:)?' + tag + rb'>)'
+        )
+        # Parser de recuperação reutilizado entre arquivos; parsers lxml
+        # são reaproveitáveis e instanciá-los por arquivo é puro overhead
+        # (cada worker do pool constrói o seu via _init_worker)
+        if HAS_LXML:
+            self._recover_parser = LET.XMLParser(
+                huge_tree=True, recover=True, encoding='utf-8'
+            )
+        else:
+            self._recover_parser = None
         self._setup_logging()
     
     def _setup_logging(self):
@@ -65,13 +192,23 @@ class XMLProcessor:
                 "⚠️  'defusedxml' não instalado. "
                 "Recomenda-se instalar: pip install defusedxml"
             )
+
+        if not HAS_LXML:
+            logging.warning(
+                "⚠️  'lxml' não instalado; usando parser padrão (mais lento). "
+                "Recomenda-se instalar: pip install lxml"
+            )
     
     def list_xml_files(self, directory: Path) -> list[Path]:
         """Lista arquivos XML no diretório."""
-        files = sorted([
-            p for p in directory.iterdir() 
-            if p.is_file() and p.suffix.lower() == ".xml"
-        ])
+        # os.scandir reaproveita o d_type do readdir (sem stat extra por
+        # entrada) e evita criar Path + suffix para quem não é .xml
+        with os.scandir(directory) as entries:
+            files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.is_file(follow_symlinks=False)
+                and entry.name.lower().endswith('.xml')
+            )
         logging.info(f"📄 Encontrados {len(files)} arquivo(s) XML")
         return files
     
@@ -82,86 +219,86 @@ class XMLProcessor:
             folder.mkdir(parents=True, exist_ok=True)
         return folder.resolve()
     
-    def create_backup(self, file_path: Path, backup_folder: Path) -> Optional[Path]:
+    def create_backup(self, file_path: Path, backup_folder: Path) -> Optional[str]:
         """Cria backup do arquivo antes de modificar."""
         if not self.config.create_backup or self.config.dry_run:
             return None
         
         try:
-            backup_path = backup_folder / file_path.name
-            if backup_path.exists():
-                base, suffix = backup_path.stem, backup_path.suffix
+            # Strings puras no caminho quente: os.path evita alocar um
+            # PurePath novo a cada composição
+            backup_dir = str(backup_folder)
+            backup_path = os.path.join(backup_dir, file_path.name)
+            if os.path.exists(backup_path):
+                # Um único listdir no lugar de um stat por tentativa
+                existing = set(os.listdir(backup_dir))
+                base, suffix = os.path.splitext(file_path.name)
                 counter = 1
-                while (new_backup := backup_folder / f"{base}_{counter}{suffix}").exists():
+                while (new_name := f"{base}_{counter}{suffix}") in existing:
                     counter += 1
-                backup_path = new_backup
-            
-            shutil.copy2(str(file_path), str(backup_path))
-            logging.debug(f"💾 Backup criado: {backup_path.name}")
+                backup_path = os.path.join(backup_dir, new_name)
+
+            shutil.copy2(str(file_path), backup_path)
+            # Forma "lazy" do logging: só formata se DEBUG estiver ativo
+            logging.debug("💾 Backup criado: %s", os.path.basename(backup_path))
             return backup_path
         except Exception as e:
             logging.error(f"❌ Falha ao criar backup de '{file_path.name}': {e}")
             return None
     
-    def try_repair_xml(self, file_path: Path) -> Optional[str]:
+    def try_repair_xml(self, file_path: Path, data: bytes) -> Optional[_ETreeClass]:
         """
         Tenta reparar XML malformado fazendo parse com lxml em modo recover,
-        ou aplicando correções simples de texto.
+        ou aplicando correções simples de texto. Opera sobre o buffer já
+        lido por process_file, sem reler o arquivo do disco.
+
+        Retorna a árvore já parseada; a serialização fica a cargo de
+        tree.write() após a substituição, evitando qualquer round-trip
+        tostring → parse.
         """
         if not self.config.try_repair:
             return None
-        
+
         try:
             # Tenta com lxml que tem modo de recuperação
-            try:
-                from lxml import etree as lxml_et
-                parser = lxml_et.XMLParser(recover=True, encoding='utf-8')
-                tree = lxml_et.parse(str(file_path), parser)
-                
-                # Converte de volta para string
-                repaired = lxml_et.tostring(
-                    tree.getroot(), 
-                    encoding='unicode', 
-                    pretty_print=True
-                )
-                
+            if HAS_LXML:
+                tree = LET.fromstring(data, self._recover_parser).getroottree()
+
                 logging.info(f"🔧 XML reparado com lxml: {file_path.name}")
                 self.stats['repaired_lxml'] += 1
-                return repaired
-                
-            except ImportError:
+                return tree
+            else:
                 # Se lxml não estiver disponível, tenta correções básicas
                 logging.debug("lxml não disponível, tentando correção manual")
-                return self._manual_repair(file_path)
-                
+                repaired = self._manual_repair(
+                    file_path, data.decode('utf-8', errors='replace')
+                )
+                if repaired is None:
+                    return None
+
+                from io import StringIO
+                return ET.parse(StringIO(repaired))
+
         except Exception as e:
-            logging.debug(f"Reparo falhou para '{file_path.name}': {e}")
+            logging.debug("Reparo falhou para '%s': %s", file_path.name, e)
             return None
     
-    def _manual_repair(self, file_path: Path) -> Optional[str]:
+    def _manual_repair(
+        self, file_path: Path, content: Optional[str] = None
+    ) -> Optional[str]:
         """Tenta correções manuais simples em XMLs malformados."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
             original_content = content
             
             # Correção 1: Remove caracteres de controle inválidos
-            content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F]', '', content)
-            
+            content = content.translate(_CTRL_DELETE_TABLE)
+
             # Correção 2: Fecha tags não fechadas (básico)
-            # Procura padrão de tag aberta sem fechamento
-            open_tags = re.findall(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*>', content)
-            close_tags = re.findall(r'</([a-zA-Z][a-zA-Z0-9]*)>', content)
-            
-            # Identifica tags não fechadas
-            from collections import Counter as CounterColl
-            open_count = CounterColl(open_tags)
-            close_count = CounterColl(close_tags)
-            
-            unclosed = {tag: count - close_count.get(tag, 0) 
-                       for tag, count in open_count.items() 
-                       if count > close_count.get(tag, 0)}
+            unclosed = _find_unclosed_tags(content)
             
             # Adiciona fechamentos no final (antes da tag raiz fechar)
             if unclosed:
@@ -181,7 +318,7 @@ class XMLProcessor:
                 return content
             
         except Exception as e:
-            logging.debug(f"Correção manual falhou: {e}")
+            logging.debug("Correção manual falhou: %s", e)
         
         return None
     
@@ -193,80 +330,298 @@ class XMLProcessor:
         """
         Busca elemento por nome local, ignorando namespaces.
         Suporta tags como {namespace}localname.
+
+        Usa o curinga '{*}' de find(), resolvido em C (lxml e ET >= 3.8),
+        em vez de varrer a árvore com .iter() + split() por elemento.
         """
-        for el in root.iter():
-            if el.tag.split('}')[-1] == local_name:
-                return el
-        return None
+        if str(root.tag).split('}')[-1] == local_name:
+            return root
+        return root.find(f'.//{{*}}{local_name}')
     
-    def safe_move(self, src: Path, dst: Path) -> None:
-        """Move arquivo evitando sobrescrever destinos existentes."""
+    def safe_move(self, src: Path, dst_dir, ensure_parent: bool = True) -> None:
+        """
+        Move o arquivo para dentro de dst_dir evitando sobrescrever
+        destinos existentes. Compõe caminhos com os.path (strings puras)
+        em vez de alocar objetos Path a cada arquivo.
+
+        Com ensure_parent=False o mkdir é pulado (caso das pastas de
+        destino já criadas uma única vez em run()).
+        """
+        dst_dir = str(dst_dir)
+
         if self.config.dry_run:
-            logging.info(f"[DRY-RUN] Moveria: {src.name} → {dst.parent.name}/")
+            logging.info(
+                f"[DRY-RUN] Moveria: {src.name} → {os.path.basename(dst_dir)}/"
+            )
             return
-        
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        
-        if dst.exists():
-            base, suffix = dst.stem, dst.suffix
+
+        if ensure_parent:
+            os.makedirs(dst_dir, exist_ok=True)
+
+        dst = os.path.join(dst_dir, src.name)
+        if os.path.exists(dst):
+            # Um único listdir no lugar de um stat por tentativa: com
+            # muitas colisões foo_1, foo_2... o custo sai de O(k) syscalls
+            # para O(1) syscall + buscas em memória
+            existing = set(os.listdir(dst_dir))
+            base, suffix = os.path.splitext(src.name)
             counter = 1
-            while (new_dst := dst.parent / f"{base}_{counter}{suffix}").exists():
+            while (new_name := f"{base}_{counter}{suffix}") in existing:
                 counter += 1
-            dst = new_dst
-        
-        shutil.move(str(src), str(dst))
-        logging.debug(f"Movido: {src.name} → {dst}")
+            dst = os.path.join(dst_dir, new_name)
+
+        # No mesmo filesystem (caso comum: subpastas de base_dir),
+        # os.replace é um único syscall; shutil.move fica de fallback
+        # para movimentos entre discos
+        try:
+            os.replace(src, dst)
+        except OSError:
+            shutil.move(str(src), dst)
+        # Forma "lazy": evita formatar a f-string (e o str(dst)) por
+        # arquivo quando DEBUG está desligado, que é o padrão
+        logging.debug("Movido: %s → %s", src.name, dst)
     
+    def _try_byte_fast_path(
+        self,
+        file_path: Path,
+        data: bytes,
+        error_folder: Path,
+        backup_folder: Path
+    ) -> Optional[bool]:
+        """
+        Substituição byte a byte para o caso comum: um único elemento alvo
+        com texto simples, e todas as ocorrências do alvo dentro dele.
+        Evita o round-trip parse + serialização (geralmente ~90% do custo
+        de CPU por arquivo).
+
+        Retorna o resultado do processamento, ou None quando a estrutura
+        não é trivial e o caminho normal via DOM deve ser usado.
+        """
+        needle = self.config.old_value.encode('utf-8')
+
+        matches = self._target_text_re.finditer(data)
+        match = next(matches, None)
+        if match is None or next(matches, None) is not None:
+            return None  # Zero ou múltiplos elementos: deixa para o DOM
+
+        text = match.group(2)
+        # Todas as ocorrências precisam estar no texto do elemento alvo;
+        # alvo em atributos, outras tags ou como entidade vai para o DOM
+        if needle not in text or data.count(needle) != text.count(needle):
+            return None
+
+        replacements = text.count(needle)
+
+        if self.config.dry_run:
+            logging.info(
+                f"[DRY-RUN] Alteraria '{file_path.name}': "
+                f"{replacements} ocorrência(s) de '{self.config.old_value}'"
+            )
+            self.stats['would_change'] += 1
+            return True
+
+        self.create_backup(file_path, backup_folder)
+
+        new_text = _replace_target_bytes(
+            text, needle, self.config.new_value.encode('utf-8')
+        )
+        try:
+            file_path.write_bytes(
+                data[:match.start(2)] + new_text + data[match.end(2):]
+            )
+        except OSError as e:
+            logging.error(f"❌ Falha ao salvar '{file_path.name}': {e}")
+            self.stats['save_error'] += 1
+            self.safe_move(file_path, error_folder, ensure_parent=False)
+            return False
+
+        logging.info(f"✓ Alterado '{file_path.name}': {replacements} substituição(ões)")
+        self.stats['changed'] += 1
+        return True
+
+    def _try_mmap_fast_path(
+        self,
+        file_path: Path,
+        error_folder: Path,
+        no_match_folder: Path,
+        backup_folder: Path
+    ) -> Optional[bool]:
+        """
+        Variante do caminho rápido para arquivos grandes: o kernel pagina
+        o conteúdo via mmap e a substituição encolhe o buffer no lugar
+        ('É' em UTF-8 tem 2 bytes, 'E' tem 1), movendo só a cauda, em vez
+        de alocar duas cópias do arquivo inteiro em memória Python.
+
+        Retorna o resultado do processamento ou None para cair no caminho
+        normal, que relê o arquivo em bytes.
+        """
+        needle = self.config.old_value.encode('utf-8')
+        replacement = self.config.new_value.encode('utf-8')
+        if len(replacement) > len(needle):
+            return None  # edição in-place só quando o conteúdo não cresce
+
+        outcome = None
+        modified = False
+        try:
+            with open(file_path, 'r+b') as f:
+                mm = mmap.mmap(f.fileno(), 0)
+                try:
+                    # Mesmo pré-filtro de process_file, direto no mmap
+                    if all(mm.find(n) == -1 for n in self._needles):
+                        outcome = 'no_match'
+                    else:
+                        matches = self._target_text_re.finditer(mm)
+                        match = next(matches, None)
+                        if match is None or next(matches, None) is not None:
+                            return None
+
+                        text = match.group(2)  # copia só o texto do elemento
+                        replacements = text.count(needle)
+                        total = 0
+                        pos = mm.find(needle)
+                        while pos != -1:
+                            total += 1
+                            pos = mm.find(needle, pos + len(needle))
+                        if replacements == 0 or total != replacements:
+                            return None
+
+                        self.create_backup(file_path, backup_folder)
+
+                        new_text = _replace_target_bytes(text, needle, replacement)
+                        start, end = match.start(2), match.end(2)
+                        size = mm.size()
+                        shrink = (end - start) - len(new_text)
+                        modified = True
+                        mm[start:start + len(new_text)] = new_text
+                        if shrink:
+                            mm.move(start + len(new_text), end, size - end)
+                        mm.flush()
+                        outcome = 'changed'
+                finally:
+                    # No Windows o truncate exige o mapeamento já fechado
+                    mm.close()
+                if outcome == 'changed' and shrink:
+                    f.truncate(size - shrink)
+        except (OSError, ValueError) as e:
+            if not modified:
+                return None  # mmap indisponível: caminho normal resolve
+            logging.error(f"❌ Falha ao salvar '{file_path.name}': {e}")
+            self.stats['save_error'] += 1
+            self.safe_move(file_path, error_folder, ensure_parent=False)
+            return False
+
+        if outcome == 'no_match':
+            logging.info(f"○ '{self.config.old_value}' não encontrado: {file_path.name}")
+            self.stats['no_match'] += 1
+            self.safe_move(file_path, no_match_folder, ensure_parent=False)
+            return False
+
+        logging.info(f"✓ Alterado '{file_path.name}': {replacements} substituição(ões)")
+        self.stats['changed'] += 1
+        return True
+
     def process_file(self, file_path: Path, error_folder: Path, no_match_folder: Path, backup_folder: Path) -> bool:
         """
         Processa um arquivo XML individual.
         Retorna True se houve alteração, False caso contrário.
         """
         tree = None
-        repaired_content = None
-        
-        # Primeira tentativa de parse
+        xtexto = None
+
+        # Arquivos grandes: tenta resolver via mmap, sem carregar o
+        # conteúdo inteiro em buffers Python
+        if not self.config.dry_run:
+            try:
+                is_large = file_path.stat().st_size >= _MMAP_THRESHOLD
+            except OSError:
+                is_large = False
+            if is_large:
+                mmap_result = self._try_mmap_fast_path(
+                    file_path, error_folder, no_match_folder, backup_folder
+                )
+                if mmap_result is not None:
+                    return mmap_result
+
+        # Leitura única + pré-filtro em bytes: a maioria dos arquivos não
+        # contém o alvo e nem precisa ser parseada ('in' sobre bytes roda
+        # em C, na casa de GB/s)
         try:
-            tree = ET.parse(str(file_path))
-            root = tree.getroot()
-            
-        except ET.ParseError as e:
+            data = file_path.read_bytes()
+        except OSError as e:
+            logging.error(f"❌ Erro inesperado '{file_path.name}': {e}")
+            self.stats['unexpected_error'] += 1
+            self.safe_move(file_path, error_folder, ensure_parent=False)
+            return False
+
+        if not any(needle in data for needle in self._needles):
+            logging.info(f"○ '{self.config.old_value}' não encontrado: {file_path.name}")
+            self.stats['no_match'] += 1
+            self.safe_move(file_path, no_match_folder, ensure_parent=False)
+            return False
+
+        # Caso trivial resolvido direto nos bytes, sem construir DOM
+        fast_result = self._try_byte_fast_path(
+            file_path, data, error_folder, backup_folder
+        )
+        if fast_result is not None:
+            return fast_result
+
+        # Primeira tentativa de parse (lxml é ~2-5x mais rápido que o ET puro;
+        # reusa o buffer já lido, sem segunda leitura do disco)
+        try:
+            if HAS_LXML:
+                # iterparse com filtro de tag acha o alvo em C durante o
+                # próprio parse; o resto do documento é consumido para
+                # completar a árvore, que ainda é necessária na escrita
+                context = LET.iterparse(
+                    BytesIO(data),
+                    events=('end',),
+                    tag=f'{{*}}{self.config.target_element}',
+                    huge_tree=True
+                )
+                for _, elem in context:
+                    if xtexto is None:
+                        xtexto = elem
+                root = context.root
+                tree = root.getroottree()
+            else:
+                root = ET.fromstring(data)
+                tree = _ETreeClass(root)
+
+        except _PARSE_ERRORS as e:
             logging.warning(f"⚠️  Parse falhou '{file_path.name}': {e}")
             
-            # Tenta reparar
-            repaired_content = self.try_repair_xml(file_path)
-            
-            if repaired_content:
-                # Salva versão reparada temporariamente
-                try:
-                    from io import StringIO
-                    tree = ET.parse(StringIO(repaired_content))
-                    root = tree.getroot()
-                    logging.info(f"✓ XML reparado com sucesso: {file_path.name}")
-                except Exception as repair_error:
-                    logging.error(f"❌ Reparo falhou '{file_path.name}': {repair_error}")
-                    self.stats['parse_error'] += 1
-                    self.safe_move(file_path, error_folder / file_path.name)
-                    return False
+            # Tenta reparar reaproveitando o buffer já lido
+            tree = self.try_repair_xml(file_path, data)
+
+            if tree is not None:
+                # Reusa a árvore já parseada, sem segundo parse. Um
+                # elemento capturado pelo iterparse abortado pertence à
+                # árvore descartada; a busca precisa rodar de novo na
+                # árvore reparada
+                xtexto = None
+                root = tree.getroot()
+                logging.info(f"✓ XML reparado com sucesso: {file_path.name}")
             else:
                 logging.error(f"❌ Impossível reparar '{file_path.name}'")
                 self.stats['parse_error'] += 1
-                self.safe_move(file_path, error_folder / file_path.name)
+                self.safe_move(file_path, error_folder, ensure_parent=False)
                 return False
             
         except Exception as e:
             logging.error(f"❌ Erro inesperado '{file_path.name}': {e}")
             self.stats['unexpected_error'] += 1
-            self.safe_move(file_path, error_folder / file_path.name)
+            self.safe_move(file_path, error_folder, ensure_parent=False)
             return False
         
-        # Busca elemento alvo
-        xtexto = self.find_element_by_local_name(root, self.config.target_element)
-        
+        # Busca elemento alvo (já resolvido pelo iterparse no caminho lxml)
+        if xtexto is None:
+            xtexto = self.find_element_by_local_name(root, self.config.target_element)
+
         if xtexto is None or not (xtexto.text and xtexto.text.strip()):
             logging.info(f"⊘ Elemento <{self.config.target_element}> vazio: {file_path.name}")
             self.stats['empty_element'] += 1
-            self.safe_move(file_path, error_folder / file_path.name)
+            self.safe_move(file_path, error_folder, ensure_parent=False)
             return False
         
         # Verifica necessidade de alteração
@@ -276,11 +631,20 @@ class XMLProcessor:
         if new_text == old_text:
             logging.info(f"○ '{self.config.old_value}' não encontrado: {file_path.name}")
             self.stats['no_match'] += 1
-            self.safe_move(file_path, no_match_folder / file_path.name)
+            self.safe_move(file_path, no_match_folder, ensure_parent=False)
             return False
         
-        # Aplica alteração
-        replacements = old_text.count(self.config.old_value)
+        # Aplica alteração; a contagem é só informativa, então sai da
+        # diferença de tamanho quando possível e, no caso de valores de
+        # mesmo comprimento ('É' → 'E'), só é varrida se o log INFO for
+        # realmente emitido
+        delta = len(self.config.old_value) - len(self.config.new_value)
+        if delta:
+            replacements = (len(old_text) - len(new_text)) // delta
+        elif logging.getLogger().isEnabledFor(logging.INFO):
+            replacements = old_text.count(self.config.old_value)
+        else:
+            replacements = '?'
         xtexto.text = new_text
         
         if self.config.dry_run:
@@ -295,20 +659,14 @@ class XMLProcessor:
         self.create_backup(file_path, backup_folder)
         
         try:
-            # Se foi reparado, salva a versão reparada
-            if repaired_content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write('<?xml version="1.0" encoding="utf-8"?>\n')
-                    # Remove declaração XML se já existir no conteúdo reparado
-                    content_to_write = re.sub(r'<\?xml[^>]+\?>\s*', '', repaired_content)
-                    f.write(content_to_write)
-            else:
-                tree.write(
-                    str(file_path), 
-                    encoding="utf-8", 
-                    xml_declaration=True,
-                    method="xml"
-                )
+            # Serialização única da árvore (reparada ou não), já com a
+            # substituição aplicada; assinatura compatível entre lxml e
+            # ElementTree
+            tree.write(
+                str(file_path),
+                encoding="utf-8",
+                xml_declaration=True
+            )
             
             logging.info(f"✓ Alterado '{file_path.name}': {replacements} substituição(ões)")
             self.stats['changed'] += 1
@@ -317,7 +675,7 @@ class XMLProcessor:
         except Exception as e:
             logging.error(f"❌ Falha ao salvar '{file_path.name}': {e}")
             self.stats['save_error'] += 1
-            self.safe_move(file_path, error_folder / file_path.name)
+            self.safe_move(file_path, error_folder, ensure_parent=False)
             return False
     
     def print_summary(self):
@@ -376,12 +734,46 @@ class XMLProcessor:
         if self.config.create_backup:
             logging.info(f"💾 Pasta de backup: {backup_folder.name}")
         
-        for xml_file in xml_files:
-            self.process_file(xml_file, error_folder, no_match_folder, backup_folder)
-        
+        tasks = [
+            (f, error_folder, no_match_folder, backup_folder) for f in xml_files
+        ]
+        max_workers = self.config.max_workers or os.cpu_count() or 1
+
+        if len(tasks) == 1 or max_workers == 1:
+            for task in tasks:
+                self.process_file(*task)
+        else:
+            # Cada arquivo é independente (entrada e destino distintos):
+            # trabalho embaraçosamente paralelo, limitado pelo disco
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.config,),
+            ) as executor:
+                for delta in executor.map(_process_file_worker, tasks, chunksize=8):
+                    self.stats.update(delta)
+
         self.print_summary()
 
 
+# Estado por processo do pool: cada worker monta seu próprio XMLProcessor
+_WORKER: Optional["XMLProcessor"] = None
+
+
+def _init_worker(config: Config) -> None:
+    """Inicializa o processador uma única vez por processo do pool."""
+    global _WORKER
+    _WORKER = XMLProcessor(config)
+
+
+def _process_file_worker(task) -> Counter:
+    """Processa um arquivo no worker e devolve o delta de estatísticas."""
+    file_path, error_folder, no_match_folder, backup_folder = task
+    _WORKER.stats = Counter()
+    _WORKER.process_file(file_path, error_folder, no_match_folder, backup_folder)
+    return _WORKER.stats
+
+
 def main():
     """Ponto de entrada principal."""
     config = Config(
@@ -397,6 +789,8 @@ def main():
 
 
 if __name__ == "__main__":
+    from multiprocessing import freeze_support
+    freeze_support()  # Necessário para o executável PyInstaller no Windows
     main()
     print("PRESSIONE QUALQUER TECLA PARA SAIR")
     exit = input()
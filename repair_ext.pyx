@@ -0,0 +1,88 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Extensão opcional de reparo: varredura única de balanceamento de tags.
+
+Equivalente compilado do par de regex _OPEN_TAG/_CLOSE_TAG usado por
+_manual_repair em index.py, mas numa só passada sobre o buffer de bytes,
+sem listas intermediárias nem dois Counters por arquivo.
+
+Compilar com: python setup.py build_ext --inplace
+"""
+
+
+cpdef dict unclosed_tags(bytes content):
+    """Conta tags abertas sem fechamento; retorna {nome_em_bytes: saldo}."""
+    cdef const unsigned char[:] buf = content
+    cdef Py_ssize_t n = len(content)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t start
+    cdef Py_ssize_t j
+    cdef Py_ssize_t inner_start
+    cdef bint closing
+    cdef unsigned char c
+    cdef dict opens = {}
+    cdef dict closes = {}
+    cdef dict unclosed = {}
+    cdef object name
+    cdef object inner
+
+    while i < n:
+        if buf[i] != 0x3C:  # '<'
+            i += 1
+            continue
+        i += 1
+        if i >= n:
+            break
+        closing = buf[i] == 0x2F  # '/'
+        if closing:
+            i += 1
+            if i >= n:
+                break
+        c = buf[i]
+        if not ((0x41 <= c <= 0x5A) or (0x61 <= c <= 0x7A)):
+            continue  # '<!', '<?' etc.: não é tag simples
+        start = i
+        while i < n:
+            c = buf[i]
+            if ((0x41 <= c <= 0x5A) or (0x61 <= c <= 0x7A)
+                    or (0x30 <= c <= 0x39)):
+                i += 1
+            else:
+                break
+        name = content[start:i]
+        if closing:
+            # Como na regex, fechamento exige '>' logo após o nome
+            if i < n and buf[i] == 0x3E:
+                closes[name] = closes.get(name, 0) + 1
+        else:
+            # Abertura aceita atributos até o próximo '>'. A regex
+            # _CLOSE_TAG varre o conteúdo de forma independente, então um
+            # '</nome>' completo dentro desse trecho (ex.: '<b attr</b>')
+            # ainda conta como fechamento; seu '>' também encerra o span
+            while i < n and buf[i] != 0x3E:
+                if buf[i] == 0x3C and i + 1 < n and buf[i + 1] == 0x2F:
+                    j = i + 2
+                    if j < n:
+                        c = buf[j]
+                        if (0x41 <= c <= 0x5A) or (0x61 <= c <= 0x7A):
+                            inner_start = j
+                            while j < n:
+                                c = buf[j]
+                                if ((0x41 <= c <= 0x5A) or (0x61 <= c <= 0x7A)
+                                        or (0x30 <= c <= 0x39)):
+                                    j += 1
+                                else:
+                                    break
+                            if j < n and buf[j] == 0x3E:
+                                inner = content[inner_start:j]
+                                closes[inner] = closes.get(inner, 0) + 1
+                                i = j
+                                break
+                i += 1
+            if i < n:
+                opens[name] = opens.get(name, 0) + 1
+
+    for name, count in opens.items():
+        if count > closes.get(name, 0):
+            unclosed[name] = count - closes.get(name, 0)
+    return unclosed
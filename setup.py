@@ -0,0 +1,19 @@
+"""
+Compila a extensão opcional de reparo (repair_ext).
+
+Uso: python setup.py build_ext --inplace
+
+O script principal (index.py) funciona normalmente sem a extensão,
+caindo no caminho em Python puro.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="repair_ext",
+    ext_modules=cythonize(
+        [Extension("repair_ext", ["repair_ext.pyx"], extra_compile_args=["-O3"])],
+        language_level=3,
+    ),
+)